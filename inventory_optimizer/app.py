@@ -6,7 +6,12 @@ Main entry point for the interactive dashboard.
 
 import streamlit as st
 import pandas as pd
+import hashlib
+import io
+import os
+import pickle
 import sys
+import tempfile
 from pathlib import Path
 
 # Add project root to Python path for imports
@@ -14,13 +19,10 @@ project_root = Path(__file__).parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-# Import project modules
+# Import project modules. Forecasting, optimization, recommendation and
+# plotting modules (and their scipy/plotly/gurobipy dependencies) are
+# imported where first used to keep cold start fast.
 from inventory_optimizer import data
-from inventory_optimizer import forecasting
-from inventory_optimizer import optimizer_scipy
-from inventory_optimizer import optimizer_gurobi
-from inventory_optimizer import recommender
-from inventory_optimizer import visualization
 from inventory_optimizer.config import DEFAULT_FORECAST_WINDOW
 
 # Page configuration
@@ -44,6 +46,289 @@ if "recommendations" not in st.session_state:
     st.session_state.recommendations = None
 
 
+# Cached pipeline stages. Streamlit reruns the whole script on every widget
+# interaction, so repeated clicks with unchanged inputs are served from cache.
+@st.cache_data(show_spinner=False)
+def _load_sample():
+    """Load the bundled sample sales history."""
+    return data.load_sample_data()
+
+
+@st.cache_data(show_spinner=False)
+def _load_uploaded(file_bytes: bytes):
+    """Parse an uploaded CSV, keyed on its raw bytes."""
+    return data.load_uploaded_csv(io.BytesIO(file_bytes))
+
+
+@st.cache_data(show_spinner=False)
+def _preprocess(sales_df: pd.DataFrame, freq: str):
+    """Aggregate sales history at the given frequency."""
+    return data.preprocess_sales(sales_df, freq=freq)
+
+
+@st.cache_data(show_spinner=False)
+def _forecast(processed_df: pd.DataFrame, freq: str, window: int):
+    """Compute baseline demand forecasts."""
+    from inventory_optimizer import forecasting
+
+    return forecasting.compute_baseline_forecast(processed_df, freq=freq, window=window)
+
+
+@st.cache_data(show_spinner=False)
+def _optimize_scipy(forecast_df: pd.DataFrame, budget: float | None, capacity: float | None):
+    """Run the scipy optimization engine."""
+    from inventory_optimizer import optimizer_scipy
+
+    return optimizer_scipy.optimize_inventory_scipy(forecast_df, budget=budget, capacity=capacity)
+
+
+# Recommendations are also persisted on disk so they survive app restarts.
+# Entries are keyed on the recommender source as well as its inputs, so
+# editing recommender.py invalidates them, and only the most recently used
+# RECOMMENDATION_CACHE_MAX_ENTRIES files are kept.
+RECOMMENDATION_CACHE_DIR = Path.home() / ".cache" / "inv_opt"
+RECOMMENDATION_CACHE_MAX_ENTRIES = 64
+
+
+def _recommendation_cache_key(
+    result_df: pd.DataFrame,
+    budget: float | None,
+    capacity: float | None,
+    recommender_source: bytes
+) -> str:
+    """blake2b fingerprint of the recommender source and its inputs."""
+    digest = hashlib.blake2b(recommender_source, digest_size=16)
+    digest.update(repr((budget, capacity)).encode())
+    digest.update(_frame_key(result_df).encode())
+    return digest.hexdigest()
+
+
+def _evict_recommendation_cache():
+    """Delete all but the RECOMMENDATION_CACHE_MAX_ENTRIES most recently used entries."""
+    entries = sorted(
+        RECOMMENDATION_CACHE_DIR.glob("*.pkl"),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True
+    )
+    for path in entries[RECOMMENDATION_CACHE_MAX_ENTRIES:]:
+        path.unlink(missing_ok=True)
+
+
+@st.cache_data(show_spinner=False)
+def _recommend(result_df: pd.DataFrame, budget: float | None, capacity: float | None):
+    """
+    Compute cost breakdown and recommendations.
+
+    Results are persisted under RECOMMENDATION_CACHE_DIR so a previously
+    seen optimization is reused across sessions and app restarts.
+    """
+    from inventory_optimizer import recommender
+
+    key = _recommendation_cache_key(
+        result_df, budget, capacity, Path(recommender.__file__).read_bytes()
+    )
+    path = RECOMMENDATION_CACHE_DIR / f"{key}.pkl"
+
+    try:
+        rec = pickle.loads(path.read_bytes())
+    except Exception:
+        rec = None  # Missing or unreadable entry: recompute
+
+    if rec is not None:
+        try:
+            path.touch()  # Mark as recently used
+        except OSError:
+            pass  # Read-only cache directory: still serve the hit
+        return rec
+
+    rec = recommender.make_recommendations(result_df, budget=budget, capacity=capacity)
+
+    # Best effort: write atomically so concurrent sessions never read a
+    # partial file, and skip caching if the directory is not writable
+    try:
+        RECOMMENDATION_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=RECOMMENDATION_CACHE_DIR, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(rec, f)
+            os.replace(tmp_path, path)
+        except Exception:
+            # Don't leave a partial temp file behind; eviction only sees *.pkl
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        _evict_recommendation_cache()
+    except OSError:
+        pass
+
+    return rec
+
+
+# Cached figures. Figures are keyed on a content hash of their DataFrame;
+# the DataFrame itself is passed with a leading underscore so Streamlit
+# does not hash it again.
+def _frame_key(df: pd.DataFrame) -> str:
+    """Cheap content fingerprint of a DataFrame's columns, dtypes and rows, in order."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((list(df.columns), df.dtypes.astype(str).tolist())).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _demand_history_fig(df_key: str, sku, _df: pd.DataFrame):
+    """Build the demand history chart for one SKU."""
+    from inventory_optimizer import visualization
+
+    return visualization.plot_demand_history(_df, sku)
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _order_quantities_fig(df_key: str, _df: pd.DataFrame):
+    """Build the order quantity chart."""
+    from inventory_optimizer import visualization
+
+    return visualization.plot_order_quantities(_df)
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _cost_breakdown_fig(df_key: str, _costs):
+    """Build the cost breakdown chart from CostArrays or a DataFrame."""
+    from inventory_optimizer import visualization
+
+    return visualization.plot_cost_breakdown(_costs)
+
+
+# Main content sections. Each section is a fragment, so interacting with a
+# widget inside one section (e.g. the SKU selector) reruns only that section.
+@st.fragment
+def _render_data_preview():
+    """Section A: preview of the preprocessed demand data."""
+    st.header("Data Preview")
+    if st.session_state.processed_data is not None and not st.session_state.processed_data.empty:
+        st.subheader("Preprocessed demand data")
+        st.dataframe(st.session_state.processed_data.head(20), use_container_width=True)
+    else:
+        st.warning("No processed data available. Click 'Process Data & Forecast' to preprocess the data.")
+
+
+@st.fragment
+def _render_history():
+    """Section B: historical demand chart for a selected SKU."""
+    st.header("Historical Demand Visualization")
+    if st.session_state.processed_data is not None and not st.session_state.processed_data.empty:
+        unique_skus = sorted(st.session_state.processed_data["sku"].unique())
+        if unique_skus:
+            selected_sku = st.selectbox(
+                "Select SKU for detailed view",
+                options=unique_skus,
+                key="historical_sku"
+            )
+
+            fig = _demand_history_fig(
+                _frame_key(st.session_state.processed_data),
+                selected_sku,
+                st.session_state.processed_data
+            )
+            st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("Process data to view historical demand charts.")
+
+
+@st.fragment
+def _render_forecast():
+    """Section C: baseline forecast table."""
+    st.header("Forecasting")
+    if st.session_state.forecast_df is not None and not st.session_state.forecast_df.empty:
+        st.subheader("Baseline demand forecast per SKU")
+        st.dataframe(st.session_state.forecast_df, use_container_width=True)
+    else:
+        st.warning("No forecast data available. Click 'Process Data & Forecast' to compute forecasts.")
+
+
+@st.fragment
+def _render_optimization():
+    """Section D: optimization results and charts."""
+    st.header("Optimization")
+    if st.session_state.result_df is not None and not st.session_state.result_df.empty:
+        st.subheader("Optimization results")
+        st.dataframe(st.session_state.result_df, use_container_width=True)
+
+        # Charts
+        result_key = _frame_key(st.session_state.result_df)
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.subheader("Recommended order quantities")
+            fig_orders = _order_quantities_fig(result_key, st.session_state.result_df)
+            st.plotly_chart(fig_orders, use_container_width=True)
+
+        with col2:
+            st.subheader("Cost breakdown")
+            # Reuse the cost arrays computed for the recommendations
+            rec = st.session_state.recommendations
+            if rec and rec["arrays"] is not None:
+                fig_costs = _cost_breakdown_fig(_frame_key(rec["per_sku"]), rec["arrays"])
+            else:
+                fig_costs = _cost_breakdown_fig(result_key, st.session_state.result_df)
+            st.plotly_chart(fig_costs, use_container_width=True)
+    else:
+        st.info("Click 'Run Optimization' to compute optimal order quantities.")
+
+
+@st.fragment
+def _render_recommendations():
+    """Section E: recommendations and scenario summary."""
+    st.header("Recommendations and Scenario Summary")
+    if st.session_state.recommendations:
+        rec = st.session_state.recommendations
+
+        # Key metrics
+        if rec["metrics"]:
+            metrics = rec["metrics"]
+            col1, col2, col3, col4 = st.columns(4)
+
+            with col1:
+                st.metric("Total Cost", f"${metrics.get('total_cost', 0):,.2f}")
+
+            with col2:
+                st.metric("Purchasing Cost", f"${metrics.get('total_purchasing_cost', 0):,.2f}")
+
+            with col3:
+                budget_util = metrics.get("budget_utilization")
+                if budget_util is not None:
+                    st.metric(
+                        "Budget Utilization",
+                        f"{budget_util*100:.1f}%",
+                        f"${metrics.get('budget_used', 0):,.2f}"
+                    )
+                else:
+                    st.metric("Budget Used", f"${metrics.get('budget_used', 0):,.2f}")
+
+            with col4:
+                capacity_util = metrics.get("capacity_utilization")
+                if capacity_util is not None:
+                    st.metric(
+                        "Capacity Utilization",
+                        f"{capacity_util*100:.1f}%",
+                        f"{metrics.get('capacity_used', 0):,.1f}"
+                    )
+                else:
+                    st.metric("Capacity Used", f"{metrics.get('capacity_used', 0):,.1f}")
+
+        # Per-SKU breakdown
+        if not rec["per_sku"].empty:
+            st.subheader("Per-SKU cost breakdown")
+            st.dataframe(rec["per_sku"], use_container_width=True)
+
+        # Messages
+        if rec["messages"]:
+            st.subheader("Key Insights")
+            for message in rec["messages"]:
+                st.info(message)
+    else:
+        st.info("Run optimization to see recommendations and insights.")
+
+
 def main():
     """Main application function."""
     st.title("Demand Forecasting and Inventory Optimization System")
@@ -66,7 +351,7 @@ def main():
         if data_source == "Use sample data":
             try:
                 if st.session_state.sales_data is None:
-                    st.session_state.sales_data = data.load_sample_data()
+                    st.session_state.sales_data = _load_sample()
                 st.success("Sample data loaded")
             except Exception as e:
                 st.error(f"Error loading sample data: {str(e)}")
@@ -80,7 +365,7 @@ def main():
 
             if uploaded_file is not None:
                 try:
-                    st.session_state.sales_data = data.load_uploaded_csv(uploaded_file)
+                    st.session_state.sales_data = _load_uploaded(uploaded_file.getvalue())
                     st.success("File uploaded successfully")
                 except Exception as e:
                     st.error(f"Error loading file: {str(e)}")
@@ -144,7 +429,7 @@ def main():
             if st.session_state.sales_data is not None:
                 try:
                     with st.spinner("Processing data..."):
-                        st.session_state.processed_data = data.preprocess_sales(
+                        st.session_state.processed_data = _preprocess(
                             st.session_state.sales_data, freq=freq
                         )
 
@@ -152,7 +437,7 @@ def main():
                         st.warning("Processed data is empty. Check your data and frequency selection.")
                     else:
                         with st.spinner("Computing forecasts..."):
-                            st.session_state.forecast_df = forecasting.compute_baseline_forecast(
+                            st.session_state.forecast_df = _forecast(
                                 st.session_state.processed_data,
                                 freq=freq,
                                 window=forecast_window
@@ -171,13 +456,15 @@ def main():
                 try:
                     with st.spinner("Optimizing..."):
                         if engine_option == "Scipy (Simple)":
-                            st.session_state.result_df = optimizer_scipy.optimize_inventory_scipy(
+                            st.session_state.result_df = _optimize_scipy(
                                 st.session_state.forecast_df,
                                 budget=budget,
                                 capacity=capacity
                             )
                         else:  # Gurobi
                             try:
+                                from inventory_optimizer import optimizer_gurobi
+
                                 st.session_state.result_df = optimizer_gurobi.optimize_inventory_gurobi(
                                     st.session_state.forecast_df,
                                     budget=budget,
@@ -185,14 +472,14 @@ def main():
                                 )
                             except ImportError:
                                 st.warning("Gurobi not available, falling back to Scipy engine.")
-                                st.session_state.result_df = optimizer_scipy.optimize_inventory_scipy(
+                                st.session_state.result_df = _optimize_scipy(
                                     st.session_state.forecast_df,
                                     budget=budget,
                                     capacity=capacity
                                 )
 
                     # Generate recommendations
-                    st.session_state.recommendations = recommender.make_recommendations(
+                    st.session_state.recommendations = _recommend(
                         st.session_state.result_df,
                         budget=budget,
                         capacity=capacity
@@ -209,121 +496,19 @@ def main():
         st.info("Please load data using the sidebar controls to get started.")
         return
 
-    # Section A: Data Preview
-    st.header("Data Preview")
-    if st.session_state.processed_data is not None and not st.session_state.processed_data.empty:
-        st.subheader("Preprocessed demand data")
-        st.dataframe(st.session_state.processed_data.head(20), use_container_width=True)
-    else:
-        st.warning("No processed data available. Click 'Process Data & Forecast' to preprocess the data.")
-
+    _render_data_preview()
     st.divider()
 
-    # Section B: Historical Demand Visualization
-    st.header("Historical Demand Visualization")
-    if st.session_state.processed_data is not None and not st.session_state.processed_data.empty:
-        unique_skus = sorted(st.session_state.processed_data["sku"].unique())
-        if unique_skus:
-            selected_sku = st.selectbox(
-                "Select SKU for detailed view",
-                options=unique_skus,
-                key="historical_sku"
-            )
-
-            fig = visualization.plot_demand_history(
-                st.session_state.processed_data,
-                selected_sku
-            )
-            st.plotly_chart(fig, use_container_width=True)
-    else:
-        st.info("Process data to view historical demand charts.")
-
+    _render_history()
     st.divider()
 
-    # Section C: Forecasting
-    st.header("Forecasting")
-    if st.session_state.forecast_df is not None and not st.session_state.forecast_df.empty:
-        st.subheader("Baseline demand forecast per SKU")
-        st.dataframe(st.session_state.forecast_df, use_container_width=True)
-    else:
-        st.warning("No forecast data available. Click 'Process Data & Forecast' to compute forecasts.")
-
+    _render_forecast()
     st.divider()
 
-    # Section D: Optimization
-    st.header("Optimization")
-    if st.session_state.result_df is not None and not st.session_state.result_df.empty:
-        st.subheader("Optimization results")
-        st.dataframe(st.session_state.result_df, use_container_width=True)
-
-        # Charts
-        col1, col2 = st.columns(2)
-
-        with col1:
-            st.subheader("Recommended order quantities")
-            fig_orders = visualization.plot_order_quantities(st.session_state.result_df)
-            st.plotly_chart(fig_orders, use_container_width=True)
-
-        with col2:
-            st.subheader("Cost breakdown")
-            fig_costs = visualization.plot_cost_breakdown(st.session_state.result_df)
-            st.plotly_chart(fig_costs, use_container_width=True)
-    else:
-        st.info("Click 'Run Optimization' to compute optimal order quantities.")
-
+    _render_optimization()
     st.divider()
 
-    # Section E: Recommendations and Scenario Summary
-    st.header("Recommendations and Scenario Summary")
-    if st.session_state.recommendations:
-        rec = st.session_state.recommendations
-
-        # Key metrics
-        if rec["metrics"]:
-            metrics = rec["metrics"]
-            col1, col2, col3, col4 = st.columns(4)
-
-            with col1:
-                st.metric("Total Cost", f"${metrics.get('total_cost', 0):,.2f}")
-
-            with col2:
-                st.metric("Purchasing Cost", f"${metrics.get('total_purchasing_cost', 0):,.2f}")
-
-            with col3:
-                budget_util = metrics.get("budget_utilization")
-                if budget_util is not None:
-                    st.metric(
-                        "Budget Utilization",
-                        f"{budget_util*100:.1f}%",
-                        f"${metrics.get('budget_used', 0):,.2f}"
-                    )
-                else:
-                    st.metric("Budget Used", f"${metrics.get('budget_used', 0):,.2f}")
-
-            with col4:
-                capacity_util = metrics.get("capacity_utilization")
-                if capacity_util is not None:
-                    st.metric(
-                        "Capacity Utilization",
-                        f"{capacity_util*100:.1f}%",
-                        f"{metrics.get('capacity_used', 0):,.1f}"
-                    )
-                else:
-                    st.metric("Capacity Used", f"{metrics.get('capacity_used', 0):,.1f}")
-
-        # Per-SKU breakdown
-        if not rec["per_sku"].empty:
-            st.subheader("Per-SKU cost breakdown")
-            st.dataframe(rec["per_sku"], use_container_width=True)
-
-        # Messages
-        if rec["messages"]:
-            st.subheader("Key Insights")
-            for message in rec["messages"]:
-                st.info(message)
-    else:
-        st.info("Run optimization to see recommendations and insights.")
-
+    _render_recommendations()
     st.divider()
 
     # Section F: Scenario / What-If
@@ -336,4 +521,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
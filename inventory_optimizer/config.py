@@ -2,6 +2,7 @@
 Configuration constants and helper functions for the inventory optimization system.
 """
 
+import numpy as np
 import pandas as pd
 
 # Default cost parameters
@@ -10,11 +11,19 @@ DEFAULT_HOLDING_COST = 1.0
 DEFAULT_STOCKOUT_PENALTY = 5.0
 DEFAULT_VOLUME = 1.0
 
+# Default value for each cost column
+DEFAULT_COSTS = {
+    "unit_cost": DEFAULT_UNIT_COST,
+    "holding_cost": DEFAULT_HOLDING_COST,
+    "stockout_penalty": DEFAULT_STOCKOUT_PENALTY,
+    "volume": DEFAULT_VOLUME,
+}
+
 # Forecasting defaults
 DEFAULT_FORECAST_WINDOW = 8
 
 
-def apply_default_costs(forecast_df: pd.DataFrame) -> pd.DataFrame:
+def apply_default_costs(forecast_df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
     """
     Ensure that forecast_df contains the following columns:
     - unit_cost
@@ -24,39 +33,63 @@ def apply_default_costs(forecast_df: pd.DataFrame) -> pd.DataFrame:
 
     For any missing column, add it and fill with default constants.
     Do not overwrite existing non-null values if the columns exist.
+    Cost columns are stored as float32.
 
     Parameters
     ----------
     forecast_df : pd.DataFrame
         DataFrame that should contain cost columns
+    copy : bool, default True
+        If False, modify forecast_df in place and return it. Only use this
+        when the caller owns forecast_df.
 
     Returns
     -------
     pd.DataFrame
         DataFrame with all required cost columns populated
     """
-    df = forecast_df.copy()
-
-    # Add missing columns with default values
-    if 'unit_cost' not in df.columns:
-        df['unit_cost'] = DEFAULT_UNIT_COST
-    elif df['unit_cost'].isna().any():
-        df['unit_cost'] = df['unit_cost'].fillna(DEFAULT_UNIT_COST)
+    # Fill NaNs in existing columns and add missing columns in one pass each
+    existing = {col: value for col, value in DEFAULT_COSTS.items() if col in forecast_df.columns}
+    missing = {col: value for col, value in DEFAULT_COSTS.items() if col not in forecast_df.columns}
 
-    if 'holding_cost' not in df.columns:
-        df['holding_cost'] = DEFAULT_HOLDING_COST
-    elif df['holding_cost'].isna().any():
-        df['holding_cost'] = df['holding_cost'].fillna(DEFAULT_HOLDING_COST)
+    if not copy:
+        # The caller owns forecast_df, so fill and add columns in place
+        if existing:
+            forecast_df.fillna(existing, inplace=True)
+        for col, value in DEFAULT_COSTS.items():
+            if col in missing:
+                forecast_df[col] = np.float32(value)
+            else:
+                forecast_df[col] = forecast_df[col].astype("float32")
+        return forecast_df
 
-    if 'stockout_penalty' not in df.columns:
-        df['stockout_penalty'] = DEFAULT_STOCKOUT_PENALTY
-    elif df['stockout_penalty'].isna().any():
-        df['stockout_penalty'] = df['stockout_penalty'].fillna(DEFAULT_STOCKOUT_PENALTY)
+    df = forecast_df.fillna(existing) if existing else forecast_df
+    if missing:
+        df = df.assign(**missing)
 
-    if 'volume' not in df.columns:
-        df['volume'] = DEFAULT_VOLUME
-    elif df['volume'].isna().any():
-        df['volume'] = df['volume'].fillna(DEFAULT_VOLUME)
+    # Cost parameters need nowhere near float64 precision
+    df = df.astype({col: "float32" for col in DEFAULT_COSTS})
 
     return df
 
+
+def extract_float_array(df: pd.DataFrame, column: str) -> np.ndarray:
+    """
+    Return a column as a C-contiguous float64 array for solver input.
+
+    Avoids hidden dtype-coercion copies inside the solvers when upstream
+    dtypes have drifted (e.g. object or integer columns).
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Source DataFrame
+    column : str
+        Name of the column to extract
+
+    Returns
+    -------
+    np.ndarray
+        C-contiguous float64 array
+    """
+    return np.ascontiguousarray(df[column].to_numpy(dtype=np.float64, copy=False))
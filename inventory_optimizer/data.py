@@ -6,6 +6,31 @@ import pandas as pd
 from pathlib import Path
 from typing import Optional
 
+# Column dtypes applied by the C parser while reading sales CSVs
+SALES_DTYPES = {"sku": "category", "quantity": "float32"}
+
+
+def _read_sales_csv(source) -> pd.DataFrame:
+    """
+    Read a sales CSV, converting dtypes and parsing dates in a single pass.
+
+    Falls back to an untyped read if a value cannot be converted, leaving
+    the date and quantity cleanup to preprocess_sales. The sku column is
+    categorical with string categories either way.
+    """
+    try:
+        return pd.read_csv(
+            source,
+            dtype=SALES_DTYPES,
+            parse_dates=["date"],
+            cache_dates=True,
+            engine="c"
+        )
+    except (ValueError, TypeError):
+        if hasattr(source, "seek"):
+            source.seek(0)
+        return pd.read_csv(source, dtype={"sku": "category"})
+
 
 def load_sample_data() -> pd.DataFrame:
     """
@@ -29,15 +54,14 @@ def load_sample_data() -> pd.DataFrame:
     if not sample_file.exists():
         raise FileNotFoundError(f"Sample data file not found: {sample_file}")
 
-    df = pd.read_csv(sample_file)
-
-    # Validate required columns
+    # Validate required columns from the header before the typed read
+    header = pd.read_csv(sample_file, nrows=0)
     required_cols = ["date", "sku", "quantity"]
-    missing_cols = [col for col in required_cols if col not in df.columns]
+    missing_cols = [col for col in required_cols if col not in header.columns]
     if missing_cols:
         raise ValueError(f"Missing required columns: {missing_cols}")
 
-    return df
+    return _read_sales_csv(sample_file)
 
 
 def load_uploaded_csv(uploaded_file) -> pd.DataFrame:
@@ -60,19 +84,27 @@ def load_uploaded_csv(uploaded_file) -> pd.DataFrame:
         If required columns are missing or file is invalid
     """
     try:
-        df = pd.read_csv(uploaded_file)
+        header = pd.read_csv(uploaded_file, nrows=0)
     except Exception as e:
         raise ValueError(f"Error reading CSV file: {str(e)}")
 
-    # Validate required columns
+    # Validate required columns from the header before the typed read
     required_cols = ["date", "sku", "quantity"]
-    missing_cols = [col for col in required_cols if col not in df.columns]
+    missing_cols = [col for col in required_cols if col not in header.columns]
     if missing_cols:
         raise ValueError(
             f"Missing required columns: {missing_cols}. "
-            f"Found columns: {list(df.columns)}"
+            f"Found columns: {list(header.columns)}"
         )
 
+    # Rewind file objects after the header read; paths are simply reopened
+    if hasattr(uploaded_file, "seek"):
+        uploaded_file.seek(0)
+    try:
+        df = _read_sales_csv(uploaded_file)
+    except Exception as e:
+        raise ValueError(f"Error reading CSV file: {str(e)}")
+
     return df
 
 
@@ -97,8 +129,9 @@ def preprocess_sales(sales_df: pd.DataFrame, freq: str) -> pd.DataFrame:
 
     df = sales_df.copy()
 
-    # Convert date to datetime
-    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    # Convert date to datetime (already parsed by the CSV loaders)
+    if not pd.api.types.is_datetime64_any_dtype(df["date"]):
+        df["date"] = pd.to_datetime(df["date"], errors="coerce")
 
     # Remove rows with invalid dates
     df = df.dropna(subset=["date"])
@@ -107,36 +140,31 @@ def preprocess_sales(sales_df: pd.DataFrame, freq: str) -> pd.DataFrame:
         return pd.DataFrame(columns=["date", "sku", "quantity"])
 
     # Ensure quantity is numeric
-    df["quantity"] = pd.to_numeric(df["quantity"], errors="coerce")
+    if not pd.api.types.is_numeric_dtype(df["quantity"]):
+        df["quantity"] = pd.to_numeric(df["quantity"], errors="coerce")
     df = df.dropna(subset=["quantity"])
 
     if df.empty:
         return pd.DataFrame(columns=["date", "sku", "quantity"])
 
-    # Sort by date
-    df = df.sort_values("date")
-
     # Set date as index for resampling
     df = df.set_index("date")
 
-    # Group by SKU and resample by frequency
-    result_rows = []
-    for sku in df["sku"].unique():
-        sku_data = df[df["sku"] == sku].copy()
-
-        # Resample and sum quantities
-        resampled = sku_data["quantity"].resample(freq).sum().reset_index()
-        resampled["sku"] = sku
-        resampled = resampled[["date", "sku", "quantity"]]
-
-        result_rows.append(resampled)
-
-    if not result_rows:
-        return pd.DataFrame(columns=["date", "sku", "quantity"])
-
-    # Combine all SKUs
-    result_df = pd.concat(result_rows, ignore_index=True)
-    result_df = result_df.sort_values(["date", "sku"]).reset_index(drop=True)
+    # Categorical SKUs group on integer codes instead of hashing strings
+    df["sku"] = df["sku"].astype("category")
+
+    # Resample and sum quantities for all SKUs in a single grouped pass
+    result_df = (
+        df.groupby("sku", observed=True)["quantity"]
+        .resample(freq)
+        .sum()
+        .reset_index()
+    )
+    result_df = result_df[["date", "sku", "quantity"]]
+
+    # Resampled groups are already in date order; one stable sort orders
+    # the combined result by date, then SKU
+    result_df = result_df.sort_values(["date", "sku"], kind="mergesort", ignore_index=True)
 
     return result_df
 
@@ -3,7 +3,6 @@ Demand forecasting functions for predicting future SKU demand.
 """
 
 import pandas as pd
-import numpy as np
 from .config import DEFAULT_FORECAST_WINDOW, apply_default_costs
 
 
@@ -37,48 +36,41 @@ def compute_baseline_forecast(
             "sku", "mean_demand", "std_demand", "unit_cost",
             "holding_cost", "stockout_penalty", "volume"
         ])
-        return apply_default_costs(forecast_df)
+        return apply_default_costs(forecast_df, copy=False)
 
     if window is None:
         window = DEFAULT_FORECAST_WINDOW
 
     # Ensure date is datetime
-    if sales_df["date"].dtype != "datetime64[ns]":
-        sales_df = sales_df.copy()
-        sales_df["date"] = pd.to_datetime(sales_df["date"])
-
-    # Group by SKU and compute forecasts
-    forecast_rows = []
-
-    for sku in sales_df["sku"].unique():
-        sku_data = sales_df[sales_df["sku"] == sku].copy()
-        sku_data = sku_data.sort_values("date")
-
-        # Take the last window periods (or all if fewer available)
-        recent_data = sku_data.tail(window)
-
-        if len(recent_data) > 0:
-            quantities = recent_data["quantity"].values
-            mean_demand = float(np.mean(quantities))
-            std_demand = float(np.std(quantities)) if len(quantities) >= 2 else 0.0
-
-            # Ensure non-negative
-            mean_demand = max(0.0, mean_demand)
-            std_demand = max(0.0, std_demand)
-        else:
-            mean_demand = 0.0
-            std_demand = 0.0
-
-        forecast_rows.append({
-            "sku": sku,
-            "mean_demand": mean_demand,
-            "std_demand": std_demand
-        })
-
-    forecast_df = pd.DataFrame(forecast_rows)
+    if not pd.api.types.is_datetime64_any_dtype(sales_df["date"]):
+        sales_df = sales_df.assign(date=pd.to_datetime(sales_df["date"]))
+
+    # Sort and group on integer category codes rather than SKU strings
+    if not isinstance(sales_df["sku"].dtype, pd.CategoricalDtype):
+        sales_df = sales_df.assign(sku=sales_df["sku"].astype("category"))
+
+    # Sort once globally, then take the last window periods of each SKU
+    # (or all if fewer available)
+    sorted_df = sales_df.sort_values(["sku", "date"])
+    recent_data = sorted_df.groupby("sku", sort=False, observed=True).tail(window)
+
+    # Compute per-SKU forecasts in a single grouped reduction
+    grouped = recent_data.groupby("sku", sort=False, observed=True)["quantity"]
+    forecast_df = pd.DataFrame({
+        "mean_demand": grouped.mean(),
+        "std_demand": grouped.std(ddof=0)
+    }).reset_index()
+
+    # Ensure non-negative
+    forecast_df[["mean_demand", "std_demand"]] = (
+        forecast_df[["mean_demand", "std_demand"]]
+        .astype(float)
+        .fillna(0.0)
+        .clip(lower=0.0)
+    )
 
     # Apply default costs
-    forecast_df = apply_default_costs(forecast_df)
+    forecast_df = apply_default_costs(forecast_df, copy=False)
 
     return forecast_df
 
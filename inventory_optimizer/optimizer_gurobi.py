@@ -6,6 +6,7 @@ Intended for local use and advanced demonstrations.
 import pandas as pd
 import numpy as np
 from typing import Optional
+from .config import extract_float_array
 
 
 def optimize_inventory_gurobi(
@@ -46,55 +47,50 @@ def optimize_inventory_gurobi(
         )
 
     if params_df.empty:
-        result_df = params_df.copy()
-        result_df["Q_optimal"] = 0.0
-        return result_df
+        return params_df.assign(Q_optimal=0.0)
 
     n = len(params_df)
 
     # Extract numpy arrays
-    mean_demand = params_df["mean_demand"].values
-    c = params_df["unit_cost"].values
-    h = params_df["holding_cost"].values
-    p = params_df["stockout_penalty"].values
-    v = params_df["volume"].values
+    mean_demand = extract_float_array(params_df, "mean_demand")
+    c = extract_float_array(params_df, "unit_cost")
+    h = extract_float_array(params_df, "holding_cost")
+    p = extract_float_array(params_df, "stockout_penalty")
+    v = extract_float_array(params_df, "volume")
 
     # Create Gurobi model
     m = gp.Model("inventory_optimization")
     m.setParam("OutputFlag", 0)  # Suppress Gurobi output
 
     # Decision variables: Q[i] >= 0
-    Q = m.addVars(n, lb=0.0, name="Q")
+    Q = m.addMVar(n, lb=0.0, name="Q")
 
     # Auxiliary variables for overstock and understock
-    overstock = m.addVars(n, lb=0.0, name="overstock")
-    understock = m.addVars(n, lb=0.0, name="understock")
+    overstock = m.addMVar(n, lb=0.0, name="overstock")
+    understock = m.addMVar(n, lb=0.0, name="understock")
 
-    # Constraints for overstock and understock
-    for i in range(n):
-        # overstock[i] >= Q[i] - mean_demand[i]
-        m.addConstr(overstock[i] >= Q[i] - mean_demand[i], name=f"overstock_{i}")
-        # understock[i] >= mean_demand[i] - Q[i]
-        m.addConstr(understock[i] >= mean_demand[i] - Q[i], name=f"understock_{i}")
+    # Constraints for overstock and understock (one vector constraint each)
+    # overstock >= Q - mean_demand
+    m.addConstr(overstock >= Q - mean_demand, name="overstock")
+    # understock >= mean_demand - Q
+    m.addConstr(understock + Q >= mean_demand, name="understock")
+
+    # Ordering above mean demand only adds cost, so a budget or capacity
+    # that already covers the full mean demand cannot bind and is skipped
+    max_order = np.maximum(mean_demand, 0.0)
 
     # Budget constraint
-    if budget is not None and budget > 0:
-        m.addConstr(
-            gp.quicksum(c[i] * Q[i] for i in range(n)) <= budget,
-            name="budget"
-        )
+    if budget is not None and budget > 0 and c @ max_order > budget:
+        m.addConstr(c @ Q <= budget, name="budget")
 
     # Capacity constraint
-    if capacity is not None and capacity > 0:
-        m.addConstr(
-            gp.quicksum(v[i] * Q[i] for i in range(n)) <= capacity,
-            name="capacity"
-        )
+    if capacity is not None and capacity > 0 and v @ max_order > capacity:
+        m.addConstr(v @ Q <= capacity, name="capacity")
 
     # Objective: minimize total cost
-    purchasing = gp.quicksum(c[i] * Q[i] for i in range(n))
-    holding = gp.quicksum(h[i] * overstock[i] for i in range(n))
-    shortage = gp.quicksum(p[i] * understock[i] for i in range(n))
+    purchasing = c @ Q
+    holding = h @ overstock
+    shortage = p @ understock
 
     m.setObjective(purchasing + holding + shortage, GRB.MINIMIZE)
 
@@ -103,7 +99,7 @@ def optimize_inventory_gurobi(
         m.optimize()
 
         if m.status == GRB.OPTIMAL:
-            Q_opt = np.array([Q[i].X for i in range(n)])
+            Q_opt = Q.X
             Q_opt = np.maximum(Q_opt, 0.0)  # Ensure non-negative
         else:
             # Fallback to mean demand if optimization fails
@@ -116,8 +112,5 @@ def optimize_inventory_gurobi(
         Q_opt = np.maximum(Q_opt, 0.0)
 
     # Create result DataFrame
-    result_df = params_df.copy()
-    result_df["Q_optimal"] = Q_opt
-
-    return result_df
+    return params_df.assign(Q_optimal=Q_opt)
 
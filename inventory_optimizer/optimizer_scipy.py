@@ -5,8 +5,10 @@ Suitable for cloud deployment as it uses open-source libraries.
 
 import pandas as pd
 import numpy as np
-from scipy.optimize import minimize
+from scipy import sparse
+from scipy.optimize import linprog
 from typing import Optional
+from .config import extract_float_array
 
 
 def optimize_inventory_scipy(
@@ -15,7 +17,12 @@ def optimize_inventory_scipy(
     capacity: float | None
 ) -> pd.DataFrame:
     """
-    Solve the inventory optimization problem using scipy.optimize.minimize (SLSQP).
+    Solve the inventory optimization problem using scipy.optimize.linprog (HiGHS).
+
+    The piecewise-linear cost is linearized with auxiliary overstock and
+    understock variables. When budget and capacity do not bind, the
+    problem separates per SKU and is solved in closed form; otherwise only
+    SKUs cheaper to order than to stock out enter the linear program.
 
     Parameters
     ----------
@@ -34,94 +41,99 @@ def optimize_inventory_scipy(
         Copy of params_df with added column "Q_optimal"
     """
     if params_df.empty:
-        result_df = params_df.copy()
-        result_df["Q_optimal"] = 0.0
-        return result_df
-
-    n = len(params_df)
+        return params_df.assign(Q_optimal=0.0)
 
     # Extract numpy arrays
-    mean_demand = params_df["mean_demand"].values
-    c = params_df["unit_cost"].values
-    h = params_df["holding_cost"].values
-    p = params_df["stockout_penalty"].values
-    v = params_df["volume"].values
-
-    # Objective function
-    def objective(Q):
-        """
-        Total cost = purchasing + holding (overstock) + shortage (understock)
-        """
-        Q = np.maximum(Q, 0)  # Ensure non-negative
-
-        overstock = np.maximum(Q - mean_demand, 0)
-        understock = np.maximum(mean_demand - Q, 0)
-
-        purchasing_cost = np.sum(c * Q)
-        holding_cost = np.sum(h * overstock)
-        shortage_cost = np.sum(p * understock)
-
-        return purchasing_cost + holding_cost + shortage_cost
-
-    # Constraints
-    constraints = []
-
-    # Budget constraint: budget - sum(c_i * Q_i) >= 0
-    if budget is not None and budget > 0:
-        def budget_constraint(Q):
-            return budget - np.sum(c * Q)
-        constraints.append({"type": "ineq", "fun": budget_constraint})
-
-    # Capacity constraint: capacity - sum(v_i * Q_i) >= 0
-    if capacity is not None and capacity > 0:
-        def capacity_constraint(Q):
-            return capacity - np.sum(v * Q)
-        constraints.append({"type": "ineq", "fun": capacity_constraint})
-
-    # Bounds: Q_i >= 0 for all i
-    bounds = [(0.0, None)] * n
-
-    # Initial guess: start from mean demand
-    Q0 = mean_demand.copy()
-    Q0 = np.maximum(Q0, 0.0)
-
-    # If initial guess violates constraints, scale it down
-    if budget is not None and budget > 0:
-        total_cost = np.sum(c * Q0)
+    mean_demand = extract_float_array(params_df, "mean_demand")
+    c = extract_float_array(params_df, "unit_cost")
+    h = extract_float_array(params_df, "holding_cost")
+    p = extract_float_array(params_df, "stockout_penalty")
+    v = extract_float_array(params_df, "volume")
+
+    has_budget = budget is not None and budget > 0
+    has_capacity = capacity is not None and capacity > 0
+
+    # Per-SKU optimum ignoring budget and capacity: order the mean demand
+    # when buying is cheaper than the stockout penalty, else nothing.
+    # SKUs with c >= p stay at zero under the constraints too.
+    active = c < p
+    Q_opt = np.where(active, np.maximum(mean_demand, 0.0), 0.0)
+
+    # The per-SKU optimum is globally optimal if it satisfies the constraints;
+    # a constraint it satisfies cannot bind the constrained problem either
+    needs_budget = has_budget and c @ Q_opt > budget
+    needs_capacity = has_capacity and v @ Q_opt > capacity
+
+    if not needs_budget and not needs_capacity:
+        return params_df.assign(Q_optimal=Q_opt)
+
+    # Linear program over the active SKUs only, x = [Q, overstock, understock]
+    # minimize sum(c*Q) + sum(h*overstock) + sum(p*understock)
+    k = int(active.sum())
+    d_a, c_a, h_a, p_a, v_a = (
+        mean_demand[active], c[active], h[active], p[active], v[active]
+    )
+    cost_vec = np.concatenate([c_a, h_a, p_a])
+
+    eye = sparse.identity(k, format="csr")
+    zero = sparse.csr_matrix((k, k))
+
+    # overstock_i >= Q_i - mean_demand_i  ->  Q_i - overstock_i <= mean_demand_i
+    # understock_i >= mean_demand_i - Q_i ->  -Q_i - understock_i <= -mean_demand_i
+    A_blocks = [
+        sparse.hstack([eye, -eye, zero]),
+        sparse.hstack([-eye, zero, -eye]),
+    ]
+    b_blocks = [d_a, -d_a]
+
+    # Budget constraint: sum(c_i * Q_i) <= budget
+    if needs_budget:
+        A_blocks.append(sparse.hstack([sparse.csr_matrix(c_a), sparse.csr_matrix((1, 2 * k))]))
+        b_blocks.append([budget])
+
+    # Capacity constraint: sum(v_i * Q_i) <= capacity
+    if needs_capacity:
+        A_blocks.append(sparse.hstack([sparse.csr_matrix(v_a), sparse.csr_matrix((1, 2 * k))]))
+        b_blocks.append([capacity])
+
+    A_ub = sparse.vstack(A_blocks, format="csr")
+    b_ub = np.concatenate(b_blocks)
+
+    # Bounds: all variables >= 0
+    bounds = [(0.0, None)] * (3 * k)
+
+    # Fallback: per-SKU optimum scaled down to satisfy the constraints
+    Q0 = Q_opt[active]
+
+    if needs_budget:
+        total_cost = np.sum(c_a * Q0)
         if total_cost > budget:
             Q0 = Q0 * (budget / total_cost) * 0.95  # Scale down slightly
 
-    if capacity is not None and capacity > 0:
-        total_vol = np.sum(v * Q0)
+    if needs_capacity:
+        total_vol = np.sum(v_a * Q0)
         if total_vol > capacity:
             Q0 = Q0 * (capacity / total_vol) * 0.95  # Scale down slightly
 
     # Solve optimization problem
     try:
-        result = minimize(
-            fun=objective,
-            x0=Q0,
-            method="SLSQP",
+        result = linprog(
+            cost_vec,
+            A_ub=A_ub,
+            b_ub=b_ub,
             bounds=bounds,
-            constraints=constraints,
-            options={"maxiter": 1000, "ftol": 1e-6}
+            method="highs"
         )
 
         if result.success:
-            Q_opt = np.maximum(result.x, 0.0)
+            Q_opt[active] = np.maximum(result.x[:k], 0.0)
         else:
-            # Optimization failed - use scaled mean demand as fallback
-            Q_opt = Q0.copy()
-            Q_opt = np.maximum(Q_opt, 0.0)
+            # Optimization failed - use scaled per-SKU optimum as fallback
+            Q_opt[active] = Q0
 
     except Exception as e:
         # Fallback to initial guess if optimization fails
-        Q_opt = Q0.copy()
-        Q_opt = np.maximum(Q_opt, 0.0)
+        Q_opt[active] = Q0
 
     # Create result DataFrame
-    result_df = params_df.copy()
-    result_df["Q_optimal"] = Q_opt
-
-    return result_df
-
+    return params_df.assign(Q_optimal=Q_opt)
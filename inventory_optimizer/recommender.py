@@ -4,8 +4,176 @@ Recommendation and summary generation for inventory optimization results.
 
 import pandas as pd
 import numpy as np
+from dataclasses import dataclass
 from typing import Optional
 
+try:
+    import numexpr as ne
+except ImportError:
+    ne = None
+
+# Below this many SKUs numexpr's dispatch overhead outweighs its gains.
+# Measured crossover for the cost kernel on float32 inputs (numexpr 2.14,
+# NumPy 2.4, one thread): numexpr is ~3x slower at 1k SKUs, 0.7x at 10k
+# and breaks even at 30k
+NUMEXPR_MIN_SIZE = 30_000
+
+# Longer SKU lists in messages are truncated to this many entries
+MAX_LISTED_SKUS = 10
+
+
+def _cost_components(
+    Q: np.ndarray,
+    mean_demand: np.ndarray,
+    unit_cost: np.ndarray,
+    holding_cost: np.ndarray,
+    stockout_penalty: np.ndarray
+) -> tuple:
+    """
+    Compute per-SKU cost component arrays.
+
+    Uses numexpr, when installed, for inputs of at least NUMEXPR_MIN_SIZE
+    SKUs, where its blocked multi-threaded evaluation outpaces NumPy. The
+    overstock and understock terms are folded into the holding and
+    shortage expressions there rather than materialized.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        (purchasing, holding, shortage, total)
+    """
+    if ne is not None and Q.size >= NUMEXPR_MIN_SIZE:
+        local_dict = {
+            "Q": Q, "d": mean_demand,
+            "uc": unit_cost, "hc": holding_cost, "sp": stockout_penalty
+        }
+        purchasing = ne.evaluate("uc * Q", local_dict=local_dict)
+        holding = ne.evaluate("hc * where(Q > d, Q - d, 0)", local_dict=local_dict)
+        shortage = ne.evaluate("sp * where(d > Q, d - Q, 0)", local_dict=local_dict)
+    else:
+        diff = Q - mean_demand
+        overstock = np.where(diff > 0, diff, 0.0)
+        understock = np.where(diff < 0, -diff, 0.0)
+        purchasing = unit_cost * Q
+        holding = holding_cost * overstock
+        shortage = stockout_penalty * understock
+
+    total = purchasing + holding + shortage
+
+    return purchasing, holding, shortage, total
+
+
+def _utilization_message(
+    name: str,
+    utilization: float | None,
+    binding_note: str
+) -> str | None:
+    """
+    Describe a nearly binding (>95%) or slack (<50%) constraint.
+
+    Returns None if the constraint is unused or moderately utilized.
+    """
+    if utilization is None:
+        return None
+    if utilization > 0.95:
+        return f"{name.capitalize()} utilization is {utilization*100:.1f}%. {binding_note}"
+    if utilization < 0.5:
+        return (
+            f"{name.capitalize()} utilization is {utilization*100:.1f}%. "
+            f"Current {name} constraint is not binding."
+        )
+    return None
+
+
+def _format_skus(skus: np.ndarray) -> str:
+    """
+    Join SKU identifiers for a message, listing at most MAX_LISTED_SKUS.
+    """
+    if len(skus) <= MAX_LISTED_SKUS:
+        return ", ".join(skus)
+    return f"{', '.join(skus[:MAX_LISTED_SKUS])}, and {len(skus) - MAX_LISTED_SKUS} more"
+
+
+@dataclass
+class CostArrays:
+    """
+    Per-SKU cost breakdown stored as parallel arrays, one entry per SKU,
+    sorted by SKU.
+
+    Computed once by compute_cost_arrays and consumed directly by
+    make_recommendations and visualization.plot_cost_breakdown.
+    """
+    sku: np.ndarray
+    mean_demand: np.ndarray
+    Q: np.ndarray
+    volume: np.ndarray
+    purchasing: np.ndarray
+    holding: np.ndarray
+    shortage: np.ndarray
+    total: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.sku)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the per-SKU cost breakdown as a DataFrame for display."""
+        return pd.DataFrame({
+            "sku": self.sku,
+            "mean_demand": self.mean_demand,
+            "Q_optimal": self.Q,
+            "purchasing_cost": self.purchasing,
+            "holding_cost_component": self.holding,
+            "shortage_cost_component": self.shortage,
+            "total_cost": self.total
+        })
+
+
+def compute_cost_arrays(result_df: pd.DataFrame) -> CostArrays:
+    """
+    Compute per-SKU purchasing, holding and shortage costs.
+
+    Parameters
+    ----------
+    result_df : pd.DataFrame
+        DataFrame with columns:
+        ["sku", "mean_demand", "Q_optimal", "unit_cost",
+         "holding_cost", "stockout_penalty", "volume"]
+
+    Returns
+    -------
+    CostArrays
+        Per-SKU cost components, sorted by SKU
+    """
+    # Sort by SKU once so the breakdown can be displayed without re-sorting
+    sku = result_df["sku"].to_numpy()
+    order = np.argsort(sku, kind="stable")
+
+    # float32 halves memory traffic; totals are accumulated in float64
+    def column(name):
+        return result_df[name].to_numpy(dtype=np.float32)[order]
+
+    Q = column("Q_optimal")
+    mean_demand = column("mean_demand")
+
+    purchasing, holding, shortage, total = _cost_components(
+        Q,
+        mean_demand,
+        column("unit_cost"),
+        column("holding_cost"),
+        column("stockout_penalty")
+    )
+
+    return CostArrays(
+        sku=sku[order],
+        mean_demand=mean_demand,
+        Q=Q,
+        volume=column("volume"),
+        purchasing=purchasing,
+        holding=holding,
+        shortage=shortage,
+        total=total
+    )
+
 
 def make_recommendations(
     result_df: pd.DataFrame,
@@ -32,36 +200,50 @@ def make_recommendations(
         Dictionary with keys:
         - "metrics": dict of aggregate metrics
         - "per_sku": DataFrame with per-SKU cost breakdown
+        - "arrays": CostArrays with the same breakdown as arrays
+          (None if result_df is empty or has no orders and no demand)
         - "messages": list of short textual insights
     """
     if result_df.empty:
         return {
             "metrics": {},
             "per_sku": pd.DataFrame(),
+            "arrays": None,
             "messages": ["No data available for recommendations."]
         }
 
-    df = result_df.copy()
-
-    # Compute overstock and understock per SKU
-    df["overstock"] = np.maximum(df["Q_optimal"] - df["mean_demand"], 0)
-    df["understock"] = np.maximum(df["mean_demand"] - df["Q_optimal"], 0)
+    # Nothing ordered and no demand to miss: every cost component is zero,
+    # so skip the per-SKU breakdown. An all-zero Q alone is not enough, as
+    # unmet demand still incurs shortage costs worth reporting.
+    ordered = result_df["Q_optimal"].to_numpy().any()
+    demanded = result_df["mean_demand"].to_numpy().any()
+    if not ordered and not demanded:
+        return {
+            "metrics": {
+                "total_purchasing_cost": 0.0,
+                "total_holding_cost": 0.0,
+                "total_shortage_cost": 0.0,
+                "total_cost": 0.0,
+                "budget_used": 0.0,
+                "budget_utilization": 0.0 if budget is not None and budget > 0 else None,
+                "capacity_used": 0.0,
+                "capacity_utilization": 0.0 if capacity is not None and capacity > 0 else None,
+                "n_skus": len(result_df)
+            },
+            "per_sku": pd.DataFrame(),
+            "arrays": None,
+            "messages": ["No ordered quantities or forecast demand; nothing to recommend."]
+        }
 
-    # Compute per-SKU costs
-    df["purchasing_cost"] = df["unit_cost"] * df["Q_optimal"]
-    df["holding_cost_component"] = df["holding_cost"] * df["overstock"]
-    df["shortage_cost_component"] = df["stockout_penalty"] * df["understock"]
-    df["total_cost"] = (
-        df["purchasing_cost"] +
-        df["holding_cost_component"] +
-        df["shortage_cost_component"]
-    )
+    # Compute per-SKU costs once; the DataFrame view is only for display
+    arrays = compute_cost_arrays(result_df)
+    per_sku = arrays.to_frame()
 
     # Aggregate totals
-    total_purchasing_cost = float(df["purchasing_cost"].sum())
-    total_holding_cost = float(df["holding_cost_component"].sum())
-    total_shortage_cost = float(df["shortage_cost_component"].sum())
-    total_cost = float(df["total_cost"].sum())
+    total_purchasing_cost = float(arrays.purchasing.sum(dtype=np.float64))
+    total_holding_cost = float(arrays.holding.sum(dtype=np.float64))
+    total_shortage_cost = float(arrays.shortage.sum(dtype=np.float64))
+    total_cost = float(arrays.total.sum(dtype=np.float64))
 
     # Budget and capacity usage
     budget_used = total_purchasing_cost
@@ -69,7 +251,7 @@ def make_recommendations(
     if budget is not None and budget > 0:
         budget_utilization = budget_used / budget
 
-    capacity_used = float((df["volume"] * df["Q_optimal"]).sum())
+    capacity_used = float((arrays.volume * arrays.Q).sum(dtype=np.float64))
     capacity_utilization = None
     if capacity is not None and capacity > 0:
         capacity_utilization = capacity_used / capacity
@@ -84,80 +266,71 @@ def make_recommendations(
         "budget_utilization": budget_utilization,
         "capacity_used": capacity_used,
         "capacity_utilization": capacity_utilization,
-        "n_skus": len(df)
+        "n_skus": len(per_sku)
     }
 
-    # Per-SKU breakdown
-    per_sku = df[[
-        "sku", "mean_demand", "Q_optimal",
-        "purchasing_cost", "holding_cost_component",
-        "shortage_cost_component", "total_cost"
-    ]].copy()
-
     # Identify notable SKUs
-    top_cost_skus = df.nlargest(3, "total_cost")["sku"].tolist()
-    high_order_skus = df[df["Q_optimal"] > df["mean_demand"] * 1.2]["sku"].tolist()
-    low_order_skus = df[df["Q_optimal"] < df["mean_demand"] * 0.8]["sku"].tolist()
+    # Top 3 by total cost via O(n) partial selection, then order those 3.
+    # Ties at the k-th largest total keep first-occurrence order, as
+    # DataFrame.nlargest does
+    total = arrays.total
+    k = min(3, len(total))
+    kth = np.partition(total, len(total) - k)[len(total) - k]
+    top_idx = np.concatenate([np.flatnonzero(total > kth), np.flatnonzero(total == kth)])[:k]
+    top_idx = top_idx[np.argsort(-total[top_idx], kind="stable")]
+    top_cost_skus = arrays.sku[top_idx]
+    high_order_skus = arrays.sku[arrays.Q > arrays.mean_demand * 1.2]
+    low_order_skus = arrays.sku[arrays.Q < arrays.mean_demand * 0.8]
 
     # Generate messages
     messages = []
 
     # Overall cost breakdown
     if total_cost > 0:
-        pct_purchasing = (total_purchasing_cost / total_cost) * 100
-        pct_holding = (total_holding_cost / total_cost) * 100
-        pct_shortage = (total_shortage_cost / total_cost) * 100
+        pct_purchasing, pct_holding, pct_shortage = (
+            np.array([total_purchasing_cost, total_holding_cost, total_shortage_cost])
+            / total_cost * 100
+        )
         messages.append(
             f"Total cost breakdown: {pct_purchasing:.1f}% purchasing, "
             f"{pct_holding:.1f}% holding, {pct_shortage:.1f}% shortage."
         )
 
-    # Budget utilization
-    if budget_utilization is not None:
-        if budget_utilization > 0.95:
-            messages.append(
-                f"Budget utilization is {budget_utilization*100:.1f}%. "
+    # Budget and capacity utilization
+    messages.extend(
+        message for message in (
+            _utilization_message(
+                "budget", budget_utilization,
                 "Consider increasing budget to allow for more optimal ordering."
-            )
-        elif budget_utilization < 0.5:
-            messages.append(
-                f"Budget utilization is {budget_utilization*100:.1f}%. "
-                "Current budget constraint is not binding."
-            )
-
-    # Capacity utilization
-    if capacity_utilization is not None:
-        if capacity_utilization > 0.95:
-            messages.append(
-                f"Capacity utilization is {capacity_utilization*100:.1f}%. "
+            ),
+            _utilization_message(
+                "capacity", capacity_utilization,
                 "Warehouse capacity is nearly fully utilized."
-            )
-        elif capacity_utilization < 0.5:
-            messages.append(
-                f"Capacity utilization is {capacity_utilization*100:.1f}%. "
-                "Current capacity constraint is not binding."
-            )
+            ),
+        )
+        if message is not None
+    )
 
     # Top cost contributors
-    if top_cost_skus:
+    if len(top_cost_skus):
         messages.append(
-            f"Top cost-contributing SKUs: {', '.join(top_cost_skus)}. "
+            f"Top cost-contributing SKUs: {_format_skus(top_cost_skus)}. "
             "These drive the majority of total costs."
         )
 
     # High order quantities
-    if high_order_skus:
+    if len(high_order_skus):
         messages.append(
             f"SKUs with order quantities significantly above mean demand: "
-            f"{', '.join(high_order_skus)}. "
+            f"{_format_skus(high_order_skus)}. "
             "These may have high stockout penalties or high demand variability."
         )
 
     # Low order quantities
-    if low_order_skus:
+    if len(low_order_skus):
         messages.append(
             f"SKUs with order quantities below mean demand: "
-            f"{', '.join(low_order_skus)}. "
+            f"{_format_skus(low_order_skus)}. "
             "These may be constrained by budget or capacity, or have low stockout penalties."
         )
 
@@ -176,6 +349,7 @@ def make_recommendations(
     return {
         "metrics": metrics,
         "per_sku": per_sku,
+        "arrays": arrays,
         "messages": messages
     }
 
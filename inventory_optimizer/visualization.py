@@ -3,9 +3,14 @@ Visualization utilities for demand history, order quantities, and cost breakdown
 Uses Plotly for interactive charts compatible with Streamlit.
 """
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
+from .recommender import CostArrays, compute_cost_arrays
+
+# Series longer than this are drawn with WebGL (Scattergl) instead of SVG
+WEBGL_THRESHOLD = 1000
 
 
 def plot_demand_history(sales_df: pd.DataFrame, sku: str):
@@ -15,7 +20,9 @@ def plot_demand_history(sales_df: pd.DataFrame, sku: str):
     Parameters
     ----------
     sales_df : pd.DataFrame
-        DataFrame with columns ["date", "sku", "quantity"]
+        DataFrame with columns ["date", "sku", "quantity"]. A categorical
+        sku column (as returned by data.preprocess_sales) makes the SKU
+        filter an integer code comparison rather than a string scan.
     sku : str
         SKU identifier to plot
 
@@ -35,7 +42,7 @@ def plot_demand_history(sales_df: pd.DataFrame, sku: str):
         return fig
 
     # Filter for selected SKU
-    sku_data = sales_df[sales_df["sku"] == sku].copy()
+    sku_data = sales_df[sales_df["sku"] == sku]
 
     if sku_data.empty:
         fig = go.Figure()
@@ -47,16 +54,19 @@ def plot_demand_history(sales_df: pd.DataFrame, sku: str):
         )
         return fig
 
-    # Ensure date is datetime and sort
-    if sku_data["date"].dtype != "datetime64[ns]":
-        sku_data["date"] = pd.to_datetime(sku_data["date"])
-    sku_data = sku_data.sort_values("date")
+    # Ensure date is datetime and sort, without writing back to sku_data
+    dates = sku_data["date"]
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates)
+    dates = dates.to_numpy()
+    order = np.argsort(dates, kind="stable")
 
-    # Create line chart
+    # Create line chart, using WebGL rendering for long series
+    scatter = go.Scattergl if len(sku_data) > WEBGL_THRESHOLD else go.Scatter
     fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=sku_data["date"],
-        y=sku_data["quantity"],
+    fig.add_trace(scatter(
+        x=dates[order],
+        y=sku_data["quantity"].to_numpy()[order],
         mode="lines+markers",
         name="Demand",
         line=dict(color="#1f77b4", width=2),
@@ -99,16 +109,18 @@ def plot_order_quantities(result_df: pd.DataFrame):
         )
         return fig
 
-    df = result_df.copy().sort_values("Q_optimal", ascending=True)
+    # Order bars by quantity without sorting the whole DataFrame
+    Q = result_df["Q_optimal"].to_numpy()
+    order = np.argsort(Q, kind="stable")
 
     fig = go.Figure()
     fig.add_trace(go.Bar(
-        x=df["Q_optimal"],
-        y=df["sku"],
+        x=Q[order],
+        y=result_df["sku"].to_numpy()[order],
         orientation="h",
         name="Order Quantity",
         marker=dict(color="#2ca02c", opacity=0.7),
-        text=[f"{q:.1f}" for q in df["Q_optimal"]],
+        texttemplate="%{x:.1f}",
         textposition="auto"
     ))
 
@@ -117,30 +129,33 @@ def plot_order_quantities(result_df: pd.DataFrame):
         xaxis_title="Order Quantity",
         yaxis_title="SKU",
         template="plotly_white",
-        height=max(400, len(df) * 30),
+        height=max(400, len(Q) * 30),
         showlegend=False
     )
 
     return fig
 
 
-def plot_cost_breakdown(result_df: pd.DataFrame):
+def plot_cost_breakdown(costs: CostArrays | pd.DataFrame):
     """
     Plot cost components per SKU as a stacked bar chart.
 
     Parameters
     ----------
-    result_df : pd.DataFrame
-        DataFrame with cost components. Should contain columns:
+    costs : CostArrays | pd.DataFrame
+        Per-SKU cost components, preferably the "arrays" entry returned by
+        recommender.make_recommendations. A DataFrame with columns
         ["sku", "purchasing_cost", "holding_cost_component", "shortage_cost_component"]
-        or these will be computed from available columns.
+        is also accepted; if those are missing they are computed from
+        ["mean_demand", "Q_optimal", "unit_cost", "holding_cost",
+        "stockout_penalty", "volume"].
 
     Returns
     -------
     plotly.graph_objects.Figure
         Plotly figure object
     """
-    if result_df.empty:
+    if costs is None or len(costs) == 0:
         fig = go.Figure()
         fig.add_annotation(
             text="No cost data available",
@@ -150,58 +165,42 @@ def plot_cost_breakdown(result_df: pd.DataFrame):
         )
         return fig
 
-    df = result_df.copy()
-
-    # Check if cost columns exist, compute if missing
     required_cols = ["purchasing_cost", "holding_cost_component", "shortage_cost_component"]
-    if not all(col in df.columns for col in required_cols):
-        # Compute from available columns
-        if "Q_optimal" in df.columns and "unit_cost" in df.columns:
-            df["purchasing_cost"] = df["unit_cost"] * df["Q_optimal"]
-        else:
-            df["purchasing_cost"] = 0.0
-
-        if "Q_optimal" in df.columns and "mean_demand" in df.columns:
-            df["overstock"] = (df["Q_optimal"] - df["mean_demand"]).clip(lower=0)
-            df["understock"] = (df["mean_demand"] - df["Q_optimal"]).clip(lower=0)
-        else:
-            df["overstock"] = 0.0
-            df["understock"] = 0.0
-
-        if "holding_cost" in df.columns:
-            df["holding_cost_component"] = df["holding_cost"] * df["overstock"]
-        else:
-            df["holding_cost_component"] = 0.0
-
-        if "stockout_penalty" in df.columns:
-            df["shortage_cost_component"] = df["stockout_penalty"] * df["understock"]
-        else:
-            df["shortage_cost_component"] = 0.0
-
-    # Sort by SKU for consistent display
-    df = df.sort_values("sku")
+    if isinstance(costs, pd.DataFrame) and all(col in costs.columns for col in required_cols):
+        # Sort by SKU for consistent display
+        order = np.argsort(costs["sku"].to_numpy(), kind="stable")
+        skus = costs["sku"].to_numpy()[order]
+        purchasing = costs["purchasing_cost"].to_numpy()[order]
+        holding = costs["holding_cost_component"].to_numpy()[order]
+        shortage = costs["shortage_cost_component"].to_numpy()[order]
+    else:
+        # CostArrays are already sorted by SKU
+        if isinstance(costs, pd.DataFrame):
+            costs = compute_cost_arrays(costs)
+        skus = costs.sku
+        purchasing, holding, shortage = costs.purchasing, costs.holding, costs.shortage
 
     # Create stacked bar chart
     fig = go.Figure()
 
     fig.add_trace(go.Bar(
         name="Purchasing",
-        x=df["sku"],
-        y=df["purchasing_cost"],
+        x=skus,
+        y=purchasing,
         marker_color="#1f77b4"
     ))
 
     fig.add_trace(go.Bar(
         name="Holding",
-        x=df["sku"],
-        y=df["holding_cost_component"],
+        x=skus,
+        y=holding,
         marker_color="#ff7f0e"
     ))
 
     fig.add_trace(go.Bar(
         name="Shortage",
-        x=df["sku"],
-        y=df["shortage_cost_component"],
+        x=skus,
+        y=shortage,
         marker_color="#d62728"
     ))
 